@@ -2,13 +2,29 @@
 Alert Manager - Handles notifications and alerts
 """
 
+import asyncio
 import os
 import platform
-from typing import Optional
-from plyer import notification
+import threading
+import time
+import aiohttp
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
 
+_PLATFORM = platform.system()
+_IS_WINDOWS = _PLATFORM == 'Windows'
+_winsound = __import__('winsound') if _IS_WINDOWS else None
+
+# Longest notification message passed to plyer (Windows balloon tips cap at 256)
+_NOTIFICATION_MESSAGE_LIMIT = 256
+
+# Seconds close() waits for queued SMS to be sent before giving up
+_SMS_SHUTDOWN_TIMEOUT = 5
+
+
 class AlertType(Enum):
     """Alert severity levels"""
     INFO = "info"
@@ -24,28 +40,80 @@ class AlertManager:
         self.sound_enabled = self.config.get('sound_enabled', True)
         self.desktop_enabled = self.config.get('desktop_notifications', True)
         self.sms_enabled = self.config.get('sms_enabled', False)
+        self._notification = None  # plyer module, imported on first use
+        
+        # Desktop notifications arriving within the batch window are
+        # coalesced into a single summary notification
+        self.notification_batch_window = self.config.get('notification_batch_window', 2)
+        self._pending_notifications: List[Tuple[str, str]] = []
+        self._notification_timer: Optional[threading.Timer] = None
+        self._notification_lock = threading.Lock()
+        
+        # Resolve the custom sound file once rather than on every alert
+        sound_file = self.config.get('sound_file')
+        self._sound_path = os.path.abspath(sound_file) if sound_file and os.path.isfile(sound_file) else None
+        self.min_alert_interval = self.config.get('min_alert_interval', 60)
+        
+        # Throttle state per (title, alert type) to suppress alert storms
+        self._last_sent: Dict[Tuple[str, AlertType], float] = {}
+        self._suppressed_count: Dict[Tuple[str, AlertType], int] = defaultdict(int)
+        
+        # Alert channels are dispatched off the caller's (GUI) thread
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='alert')
+        
+        # SMS is posted to the Twilio REST API from a private event loop,
+        # started on first use and shut down by close()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._http: Optional[aiohttp.ClientSession] = None
+        self._sms_queue: Optional[asyncio.Queue] = None
+        self._sms_worker_task: Optional[asyncio.Future] = None
+        self._sms_tasks = set()  # In-flight _post_sms tasks
+        self._loop_lock = threading.Lock()
+        sms_rate = self.config.get('sms_rate_per_sec', 1.0)
+        self._sms_min_interval = 1.0 / sms_rate if sms_rate > 0 else 0.0  # <= 0: unlimited
+        self._sms_last_send = 0.0
+        self._sms_resume_at = 0.0  # No sends before this (monotonic) time after a 429
         
         # Initialize Twilio if SMS is enabled
-        self.twilio_client = None
+        self._sms_url = None
+        self._sms_auth = None
         if self.sms_enabled:
             self._init_twilio()
     
     def _init_twilio(self):
-        """Initialize Twilio client for SMS"""
-        try:
-            from twilio.rest import Client
-            account_sid = self.config.get('twilio_account_sid')
-            auth_token = self.config.get('twilio_auth_token')
-            
-            if account_sid and auth_token:
-                self.twilio_client = Client(account_sid, auth_token)
-        except ImportError:
-            print("Twilio not installed. SMS alerts disabled.")
-            self.sms_enabled = False
+        """Initialize Twilio REST settings for SMS"""
+        account_sid = self.config.get('twilio_account_sid')
+        auth_token = self.config.get('twilio_auth_token')
+        
+        if account_sid and auth_token:
+            self._sms_url = f"https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
+            self._sms_auth = aiohttp.BasicAuth(account_sid, auth_token)
     
     def send_alert(self, title: str, message: str, alert_type: AlertType = AlertType.INFO):
         """Send an alert through configured channels"""
         
+        # Throttle repeated alerts (e.g. a flapping service)
+        key = (title, alert_type)
+        now = time.monotonic()
+        last_sent = self._last_sent.get(key)
+        if last_sent is not None and now - last_sent < self.min_alert_interval:
+            self._suppressed_count[key] += 1
+            return
+        
+        self._last_sent[key] = now
+        suppressed = self._suppressed_count.pop(key, 0)
+        if suppressed:
+            message = f"{message} (repeated {suppressed} times)"
+        
+        try:
+            self._executor.submit(self._dispatch, title, message, alert_type)
+        except RuntimeError:
+            # Executor already shut down during application exit
+            pass
+    
+    def _dispatch(self, title: str, message: str, alert_type: AlertType):
+        """Deliver an alert to each enabled channel"""
         # Desktop notification
         if self.desktop_enabled:
             self._send_desktop_notification(title, message)
@@ -59,9 +127,38 @@ class AlertManager:
             self._send_sms(title, message)
     
     def _send_desktop_notification(self, title: str, message: str):
-        """Send desktop notification"""
+        """Queue desktop notification for the next batch"""
+        with self._notification_lock:
+            self._pending_notifications.append((title, message))
+            if self._notification_timer is None:
+                self._notification_timer = threading.Timer(
+                    self.notification_batch_window, self._flush_notifications
+                )
+                self._notification_timer.daemon = True
+                self._notification_timer.start()
+    
+    def _flush_notifications(self):
+        """Send pending desktop notifications as one notification"""
+        with self._notification_lock:
+            pending = self._pending_notifications
+            self._pending_notifications = []
+            self._notification_timer = None
+        
+        if not pending:
+            return
+        if len(pending) == 1:
+            title, message = pending[0]
+        else:
+            title = f"Service Monitor: {len(pending)} updates"
+            message = "\n".join(f"{pending_title}: {pending_message}" for pending_title, pending_message in pending)
+        if len(message) > _NOTIFICATION_MESSAGE_LIMIT:
+            message = message[:_NOTIFICATION_MESSAGE_LIMIT - 3] + "..."
+        
         try:
-            notification.notify(
+            if self._notification is None:
+                from plyer import notification
+                self._notification = notification
+            self._notification.notify(
                 title=title,
                 message=message,
                 app_name="Service Monitor",
@@ -73,21 +170,18 @@ class AlertManager:
     def _play_sound(self, alert_type: AlertType):
         """Play alert sound"""
         try:
-            sound_file = self.config.get('sound_file')
-            
-            if sound_file and os.path.exists(sound_file):
+            if self._sound_path:
                 # Play custom sound file
-                self._play_audio_file(sound_file)
+                self._play_audio_file(self._sound_path)
             else:
                 # Play system beep
-                if platform.system() == 'Windows':
-                    import winsound
+                if _IS_WINDOWS:
                     if alert_type == AlertType.CRITICAL:
-                        winsound.MessageBeep(winsound.MB_ICONHAND)
+                        _winsound.MessageBeep(_winsound.MB_ICONHAND)
                     elif alert_type == AlertType.WARNING:
-                        winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
+                        _winsound.MessageBeep(_winsound.MB_ICONEXCLAMATION)
                     else:
-                        winsound.MessageBeep(winsound.MB_ICONASTERISK)
+                        _winsound.MessageBeep(_winsound.MB_ICONASTERISK)
                 else:
                     # Unix-like systems
                     print('\a')  # Terminal bell
@@ -97,34 +191,145 @@ class AlertManager:
     def _play_audio_file(self, filepath: str):
         """Play audio file (WAV)"""
         try:
-            if platform.system() == 'Windows':
-                import winsound
-                winsound.PlaySound(filepath, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            if _IS_WINDOWS:
+                _winsound.PlaySound(filepath, _winsound.SND_FILENAME | _winsound.SND_ASYNC | _winsound.SND_NOWAIT)
             else:
                 # For other platforms, would need additional libraries
-                print(f"Audio playback not implemented for {platform.system()}")
+                print(f"Audio playback not implemented for {_PLATFORM}")
         except Exception as e:
             print(f"Failed to play audio file: {e}")
     
     def _send_sms(self, title: str, message: str):
-        """Send SMS alert via Twilio"""
-        if not self.twilio_client:
+        """Queue SMS alert for delivery via Twilio"""
+        if not self._sms_url:
             return
         
-        try:
-            from_number = self.config.get('twilio_from_number')
-            to_numbers = self.config.get('twilio_to_numbers', [])
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name='alert-sms', daemon=True
+                )
+                self._loop_thread.start()
             
             body = f"{title}\n{message}"
+            for to_number in self.config.get('twilio_to_numbers', []):
+                self._loop.call_soon_threadsafe(self._enqueue_sms, body, to_number)
+    
+    def _enqueue_sms(self, body: str, to_number: str):
+        """Queue an SMS (runs on the event loop)"""
+        if self._sms_queue is None:
+            self._sms_queue = asyncio.Queue()
+            self._sms_worker_task = asyncio.ensure_future(self._sms_worker())
+        self._sms_queue.put_nowait((body, to_number))
+    
+    async def _sms_worker(self):
+        """Drain the SMS queue, respecting the configured send rate"""
+        while True:
+            body, to_number = await self._sms_queue.get()
             
-            for to_number in to_numbers:
-                self.twilio_client.messages.create(
-                    body=body,
-                    from_=from_number,
-                    to=to_number
-                )
+            # Token bucket with a single token: wait out the send interval,
+            # or the Retry-After back-off if that ends later
+            now = time.monotonic()
+            delay = max(self._sms_last_send + self._sms_min_interval, self._sms_resume_at) - now
+            await asyncio.sleep(max(0.0, delay))
+            self._sms_last_send = time.monotonic()
+            
+            # Sends overlap; only their start is rate limited
+            self._track(asyncio.ensure_future(self._post_sms(body, to_number)))
+            self._sms_queue.task_done()
+    
+    async def _post_sms(self, body: str, to_number: str):
+        """Send a single SMS through the Twilio REST API"""
+        if self._http is None:
+            self._http = aiohttp.ClientSession(auth=self._sms_auth)
+        
+        data = {'To': to_number, 'Body': body}
+        messaging_service_sid = self.config.get('twilio_messaging_service_sid')
+        if messaging_service_sid:
+            data['MessagingServiceSid'] = messaging_service_sid
+        else:
+            data['From'] = self.config.get('twilio_from_number')
+        
+        retry_after = None
+        try:
+            async with self._http.post(self._sms_url, data=data) as response:
+                if response.status == 429:
+                    retry_after = self._retry_after(response.headers)
+                elif response.status >= 400:
+                    print(f"Failed to send SMS: HTTP {response.status} {await response.text()}")
         except Exception as e:
             print(f"Failed to send SMS: {e}")
+        
+        if retry_after is not None:
+            # Throughput rate exceeded - hold all sends for the back-off (the
+            # worker waits it out) and retry; the connection is already released
+            self._sms_resume_at = max(self._sms_resume_at, time.monotonic() + retry_after)
+            self._sms_queue.put_nowait((body, to_number))
+    
+    def _retry_after(self, headers) -> float:
+        """Seconds to wait after a 429, from the Retry-After header if present"""
+        try:
+            return float(headers.get('Retry-After', self._sms_min_interval or 1.0))
+        except (TypeError, ValueError):
+            return self._sms_min_interval or 1.0
+    
+    def _track(self, task: asyncio.Future):
+        """Keep a reference to a background task until it finishes"""
+        self._sms_tasks.add(task)
+        task.add_done_callback(self._sms_tasks.discard)
+    
+    async def _drain_sms(self):
+        """Wait until every queued SMS (including 429 retries) has been sent"""
+        while True:
+            await self._sms_queue.join()
+            if not self._sms_tasks:
+                return
+            await asyncio.gather(*self._sms_tasks, return_exceptions=True)
+    
+    async def _shutdown_sms(self):
+        """Flush pending SMS within the shutdown budget, then release resources"""
+        if self._sms_queue is not None:
+            try:
+                await asyncio.wait_for(self._drain_sms(), _SMS_SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                print("Timed out sending queued SMS alerts")
+            pending = [self._sms_worker_task, *self._sms_tasks]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+    
+    def close(self):
+        """Stop dispatching alerts, sending any queued SMS first"""
+        # Let submitted alerts reach their channels before the SMS loop stops
+        self._executor.shutdown(wait=True)
+        
+        # Send the pending notification batch now rather than losing it with
+        # the daemon timer
+        with self._notification_lock:
+            timer = self._notification_timer
+        if timer is not None:
+            timer.cancel()
+            self._flush_notifications()
+        
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown_sms(), loop).result(
+                timeout=_SMS_SHUTDOWN_TIMEOUT + 1
+            )
+        except Exception as e:
+            print(f"Error shutting down SMS alerts: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop_thread.join(timeout=1)
+        if not loop.is_running():
+            loop.close()
     
     def alert_service_down(self, service_name: str):
         """Alert that a service is down"""
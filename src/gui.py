@@ -6,13 +6,14 @@ import customtkinter as ctk
 from tkinter import ttk
 import threading
 import asyncio
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import matplotlib.dates as mdates
+import queue
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import numpy as np
+from dateutil.tz import tzlocal
 
-from service_monitor import ServiceMonitor, ServiceStatus
+from service_monitor import ServiceMonitor, ServiceStatus, STATUS_CODES
 from alert_manager import AlertManager, AlertType
 
 
@@ -20,6 +21,49 @@ from alert_manager import AlertManager, AlertType
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
+# Number of downsampled series kept by the graph cache
+_GRAPH_CACHE_SIZE = 16
+
+# Number of formatted clock strings kept by _format_clock
+_TIME_STR_CACHE_SIZE = 256
+
+# Graph time axis: epoch seconds are converted to matplotlib date numbers
+# with one vectorized op and displayed in local time (tzlocal follows DST
+# transitions, unlike a fixed offset)
+_LOCAL_TZ = tzlocal()
+
+# Dashboard status light colors
+_STATUS_COLOR = {
+    ServiceStatus.GREEN: "#00ff00",
+    ServiceStatus.YELLOW: "#ffff00",
+    ServiceStatus.RED: "#ff0000",
+}
+
+# Background shading per status code (green is left unshaded)
+_SPAN_COLORS = {
+    STATUS_CODES[ServiceStatus.RED]: 'red',
+    STATUS_CODES[ServiceStatus.YELLOW]: 'yellow',
+}
+
+
+def _downsample(ts: np.ndarray, values: np.ndarray, target: int):
+    """Reduce a series to about `target` points, keeping each bucket's maximum"""
+    stride = max(1, len(ts) // target)
+    if stride == 1:
+        return ts, values
+    starts = np.arange(0, len(ts), stride)
+    return ts[starts], np.maximum.reduceat(values, starts)
+
+
+def _status_runs(statuses: np.ndarray):
+    """Split status codes into (start, end, code) runs of equal status"""
+    if len(statuses) == 0:
+        return []
+    changes = np.flatnonzero(np.diff(statuses)) + 1
+    starts = np.concatenate(([0], changes))
+    ends = np.concatenate((changes, [len(statuses)]))
+    return zip(starts, ends, statuses[starts])
+
 
 class ServiceMonitorGUI:
     """Main GUI application"""
@@ -33,25 +77,61 @@ class ServiceMonitorGUI:
         self.monitor = ServiceMonitor()
         self.alert_manager = AlertManager(self.monitor.config)
         
-        # Register status change callback
+        # Monitor events are queued here and applied on the Tk thread
+        self._ui_events = queue.SimpleQueue()
+        
+        # Register status change and check completion callbacks
         self.monitor.register_callback(self.on_status_change)
+        self.monitor.register_check_callback(self.on_check_complete)
         
         # UI components
-        self.status_indicators = {}
         self.selected_service = None
+        self._last_indicator_state = {}  # service name -> last rendered state
+        self._last_time_str = {}  # service name -> last rendered "time ago" text
+        self._dirty_indicators = set()  # services with updates not yet rendered
+        self._graph_dirty = False
+        self._last_time_refresh = 0.0
+        self._time_str_cache = {}  # whole-second timestamp -> formatted clock time
+        
+        # Graph state, kept alive across updates
+        self._fig = None
+        self._ax = None
+        self._line = None
+        self._canvas = None
+        self._waiting_frame = None
+        self._epoch_datenum = None
+        self._graph_service = None
+        self._status_spans = []  # (start timestamp, end timestamp, patch) per shaded run
+        self._last_span_ts = None  # timestamp up to which status has been shaded
+        self._drawn_key = None  # history key of the data currently drawn
+        self._graph_cache = OrderedDict()  # history key + width -> line data
         
         # Create UI
         self._create_ui()
         
-        # Start monitoring in background thread
+        # Render any history loaded from disk on the first drain
+        self._dirty_indicators.update(self._tree.get_children())
+        
+        # Start monitoring in background thread with its own event loop
+        self._loop = None
+        self._monitor_task = None
         self.monitor_thread = threading.Thread(target=self._run_monitor, daemon=True)
         self.monitor_thread.start()
         
-        # Start UI update loop
-        self.window.after(1000, self._update_ui)
+        # Start UI event loop
+        self.window.after(100, self._drain_events)
     
     def _create_ui(self):
         """Create the user interface"""
+        # Shared fonts, created once rather than per widget
+        self._fonts = {
+            'title': ctk.CTkFont(size=24, weight="bold"),
+            'message': ctk.CTkFont(size=16),
+            'heading': ctk.CTkFont(size=14, weight="bold"),
+            'status': ctk.CTkFont(size=14),
+            'meta': ctk.CTkFont(size=12),
+        }
+        
         # Create notebook (tabs)
         self.notebook = ctk.CTkTabview(self.window)
         self.notebook.pack(fill="both", expand=True, padx=10, pady=10)
@@ -74,7 +154,7 @@ class ServiceMonitorGUI:
         title = ctk.CTkLabel(
             dashboard,
             text="Service Status Dashboard",
-            font=ctk.CTkFont(size=24, weight="bold")
+            font=self._fonts['title']
         )
         title.pack(pady=20)
         
@@ -85,7 +165,7 @@ class ServiceMonitorGUI:
         ctk.CTkLabel(
             legend_frame,
             text="Status Legend:",
-            font=ctk.CTkFont(size=14, weight="bold")
+            font=self._fonts['heading']
         ).pack(side="left", padx=10)
         
         # Green indicator
@@ -95,7 +175,7 @@ class ServiceMonitorGUI:
         ctk.CTkLabel(
             legend_frame,
             text="Operational",
-            font=ctk.CTkFont(size=12)
+            font=self._fonts['meta']
         ).pack(side="left", padx=(0, 15))
         
         # Yellow indicator
@@ -105,7 +185,7 @@ class ServiceMonitorGUI:
         ctk.CTkLabel(
             legend_frame,
             text="Degraded (>1s)",
-            font=ctk.CTkFont(size=12)
+            font=self._fonts['meta']
         ).pack(side="left", padx=(0, 15))
         
         # Red indicator
@@ -115,82 +195,65 @@ class ServiceMonitorGUI:
         ctk.CTkLabel(
             legend_frame,
             text="Down/Failed",
-            font=ctk.CTkFont(size=12)
+            font=self._fonts['meta']
         ).pack(side="left", padx=(0, 10))
         
-        # Status indicators container
-        self.indicators_frame = ctk.CTkScrollableFrame(dashboard)
-        self.indicators_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        
-        # Create services for indicators
-        services = self.monitor.config.get('services', [])
-        for idx, service_config in enumerate(services):
-            self._create_status_indicator(service_config['name'], idx)
-        
-        # Force frame to update its layout
-        self.indicators_frame.update_idletasks()
-    
-    def _create_status_indicator(self, service_name: str, row: int):
-        """Create a status indicator for a service"""
-        frame = ctk.CTkFrame(self.indicators_frame)
-        frame.grid(row=row, column=0, padx=10, pady=10, sticky="ew")
-        self.indicators_frame.grid_columnconfigure(0, weight=1)
-        
-        # Service name
-        name_label = ctk.CTkLabel(
-            frame,
-            text=service_name,
-            font=ctk.CTkFont(size=18, weight="bold")
-        )
-        name_label.grid(row=0, column=0, padx=20, pady=10, sticky="w")
-        
-        # Status light
-        status_canvas = ctk.CTkCanvas(frame, width=50, height=50, bg="#2b2b2b", highlightthickness=0)
-        status_canvas.grid(row=0, column=1, padx=20, pady=10)
-        circle = status_canvas.create_oval(5, 5, 45, 45, fill="gray", outline="")
-        
-        # Status text
-        status_label = ctk.CTkLabel(
-            frame,
-            text="Checking...",
-            font=ctk.CTkFont(size=14)
+        # Status table - one Treeview row per service instead of a frame
+        # of widgets per service
+        style = ttk.Style(self.window)
+        style.configure(
+            "Dashboard.Treeview",
+            background="#2b2b2b",
+            fieldbackground="#2b2b2b",
+            foreground="white",
+            rowheight=40,
+            font=self._fonts['status']
         )
-        status_label.grid(row=0, column=2, padx=20, pady=10, sticky="w")
+        style.configure("Dashboard.Treeview.Heading", font=self._fonts['heading'])
         
-        # Response time
-        response_label = ctk.CTkLabel(
-            frame,
-            text="-- ms",
-            font=ctk.CTkFont(size=12)
-        )
-        response_label.grid(row=0, column=3, padx=20, pady=10, sticky="w")
-        
-        # Last check time
-        time_label = ctk.CTkLabel(
-            frame,
-            text="Never",
-            font=ctk.CTkFont(size=12),
-            text_color="gray"
-        )
-        time_label.grid(row=0, column=4, padx=20, pady=10, sticky="e")
+        table_frame = ctk.CTkFrame(dashboard, fg_color="transparent")
+        table_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
-        # View details button
-        details_btn = ctk.CTkButton(
-            frame,
+        self._tree = ttk.Treeview(
+            table_frame,
+            columns=('status', 'rt', 'last'),
+            show='tree headings',
+            style="Dashboard.Treeview",
+            selectmode='browse'
+        )
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=self._tree.yview)
+        self._tree.configure(yscrollcommand=scrollbar.set)
+        self._tree.heading('#0', text='Service', anchor='w')
+        self._tree.heading('status', text='Status', anchor='w')
+        self._tree.heading('rt', text='Response Time', anchor='w')
+        self._tree.heading('last', text='Last Check', anchor='w')
+        self._tree.column('#0', width=300)
+        scrollbar.pack(side="right", fill="y")
+        self._tree.pack(side="left", fill="both", expand=True)
+        
+        # Row colors by status
+        for status, color in _STATUS_COLOR.items():
+            self._tree.tag_configure(status.value, background=color, foreground="black")
+        
+        # Create a row per service
+        for service_config in self.monitor.config.get('services', []):
+            service_name = service_config['name']
+            self._tree.insert('', 'end', iid=service_name, text=service_name, values=("Checking...", "-- ms", "Never"))
+        
+        # Double-click or the button opens the selected service's details
+        self._tree.bind("<Double-1>", lambda event: self._show_selected_details())
+        ctk.CTkButton(
+            dashboard,
             text="View Details",
-            command=lambda: self._show_service_details(service_name),
+            command=self._show_selected_details,
             width=100
-        )
-        details_btn.grid(row=0, column=5, padx=20, pady=10)
-        
-        # Store references
-        self.status_indicators[service_name] = {
-            'canvas': status_canvas,
-            'circle': circle,
-            'status_label': status_label,
-            'response_label': response_label,
-            'time_label': time_label
-        }
+        ).pack(pady=(0, 10))
+    
+    def _show_selected_details(self):
+        """Show details for the service selected in the dashboard table"""
+        selection = self._tree.selection()
+        if selection:
+            self._show_service_details(selection[0])
     
     def _create_details_tab(self):
         """Create details tab with graphs"""
@@ -203,7 +266,7 @@ class ServiceMonitorGUI:
         ctk.CTkLabel(
             selector_frame,
             text="Select Service:",
-            font=ctk.CTkFont(size=14)
+            font=self._fonts['status']
         ).pack(side="left", padx=10)
         
         service_names = [s['name'] for s in self.monitor.config.get('services', [])]
@@ -242,77 +305,128 @@ class ServiceMonitorGUI:
         if not self.selected_service:
             return
         
-        # Clear existing graph
-        for widget in self.graph_frame.winfo_children():
-            widget.destroy()
-        
         # Get service data
         service_data = self.monitor.get_service_data(self.selected_service)
-        if not service_data or not service_data.history:
-            # Show "waiting for data" message
-            info_frame = ctk.CTkFrame(self.graph_frame)
-            info_frame.pack(expand=True)
-            
-            ctk.CTkLabel(
-                info_frame,
-                text=f"Waiting for data from {self.selected_service}...",
-                font=ctk.CTkFont(size=16)
-            ).pack(pady=10)
-            
-            if service_data and service_data.last_check > 0:
-                last_check = datetime.fromtimestamp(service_data.last_check)
-                ctk.CTkLabel(
-                    info_frame,
-                    text=f"Last check: {last_check.strftime('%I:%M:%S %p')}",
-                    font=ctk.CTkFont(size=12),
-                    text_color="gray"
-                ).pack()
-            else:
-                ctk.CTkLabel(
-                    info_frame,
-                    text="Monitoring will begin shortly...",
-                    font=ctk.CTkFont(size=12),
-                    text_color="gray"
-                ).pack()
+        arrays = self.monitor.get_history_arrays(self.selected_service)
+        if not service_data or arrays is None or len(arrays[0]) == 0:
+            self._show_waiting_message(service_data)
             return
         
+        # Nothing to do if no new checks arrived since the last draw
+        ts, response_times, statuses = arrays
+        history_key = (self.selected_service, len(ts), ts[-1])
+        if history_key == self._drawn_key and self._canvas is not None:
+            return
+        
+        # matplotlib is only imported once there is history to draw
+        import matplotlib.dates as mdates
+        from matplotlib.artist import setp
+        
+        if self._canvas is None:
+            self._create_graph()
+        elif self._waiting_frame is not None:
+            # Swap the "waiting for data" message back out for the graph
+            self._waiting_frame.destroy()
+            self._waiting_frame = None
+            self._canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        ax = self._ax
+        if self._graph_service != self.selected_service:
+            # New service - drop the previous service's status shading
+            for _, _, patch in self._status_spans:
+                patch.remove()
+            self._status_spans = []
+            self._last_span_ts = None
+            self._graph_service = self.selected_service
+            ax.set_title(f'{self.selected_service} - 24 Hour History', color='white', fontsize=18, weight='bold', pad=20)
+        
+        # Convert timestamps to matplotlib date numbers
+        timestamps = ts / 86400.0 + self._epoch_datenum
+        
+        # Update response time line in place, downsampled to roughly one
+        # point per horizontal pixel (peaks are kept)
+        target = max(self._canvas.get_tk_widget().winfo_width(), 800)
+        cache_key = history_key + (target,)
+        line_data = self._graph_cache.get(cache_key)
+        if line_data is None:
+            line_data = _downsample(timestamps, response_times * 1000, target)  # Convert to ms
+            self._graph_cache[cache_key] = line_data
+            if len(self._graph_cache) > _GRAPH_CACHE_SIZE:
+                self._graph_cache.popitem(last=False)
+        else:
+            self._graph_cache.move_to_end(cache_key)
+        self._line.set_data(*line_data)
+        
+        # Drop shading that has scrolled out of the history window
+        while self._status_spans and self._status_spans[0][1] <= ts[0]:
+            self._status_spans.pop(0)[2].remove()
+        
+        # Color background by status, one span per run of equal status,
+        # only for intervals not yet shaded
+        first_new = 0
+        if self._last_span_ts is not None:
+            resume_ts = self._last_span_ts
+            if self._status_spans and self._status_spans[-1][1] == self._last_span_ts:
+                # The last run may continue - redraw it together with the new data
+                resume_ts, _, patch = self._status_spans.pop()
+                patch.remove()
+            first_new = int(np.searchsorted(ts, resume_ts, side='left'))
+        for start, end, code in _status_runs(statuses[first_new:-1]):
+            color = _SPAN_COLORS.get(code)
+            if color is None:
+                continue
+            start += first_new
+            end += first_new
+            patch = ax.axvspan(timestamps[start], timestamps[end], alpha=0.3, color=color)
+            self._status_spans.append((ts[start], ts[end], patch))
+        self._last_span_ts = ts[-1]
+        
+        ax.relim()
+        ax.autoscale_view()
+        
+        # Auto-format time axis based on data range
+        time_range = ts[-1] - ts[0]
+        if time_range < 3600:  # Less than 1 hour
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S', tz=_LOCAL_TZ))
+        elif time_range < 86400:  # Less than 24 hours
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M', tz=_LOCAL_TZ))
+        else:
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d %H:%M', tz=_LOCAL_TZ))
+        
+        # Rotate x-axis labels for better readability
+        setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+        
+        # Axis limits move with every new sample, so a full redraw is needed;
+        # draw_idle coalesces it with any other pending redraw
+        self._canvas.draw_idle()
+        self._drawn_key = history_key
+    
+    def _create_graph(self):
+        """Create the matplotlib figure and embed it in the details tab"""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        import matplotlib.dates as mdates
+        
+        # Clear any "waiting for data" message
+        if self._waiting_frame is not None:
+            self._waiting_frame.destroy()
+            self._waiting_frame = None
+        
         # Create matplotlib figure
         fig = Figure(figsize=(10, 6), facecolor='#2b2b2b')
         ax = fig.add_subplot(111)
         
-        # Extract data
-        timestamps = [datetime.fromtimestamp(check.timestamp) for check in service_data.history]
-        response_times = [check.response_time * 1000 for check in service_data.history]  # Convert to ms
-        statuses = [check.status for check in service_data.history]
-        
         # Plot response time
-        ax.plot(timestamps, response_times, color='#1f77b4', linewidth=2, label='Response Time')
-        
-        # Color background by status
-        for i in range(len(timestamps) - 1):
-            if statuses[i] == ServiceStatus.RED:
-                ax.axvspan(timestamps[i], timestamps[i + 1], alpha=0.3, color='red')
-            elif statuses[i] == ServiceStatus.YELLOW:
-                ax.axvspan(timestamps[i], timestamps[i + 1], alpha=0.3, color='yellow')
+        self._line, = ax.plot([], [], color='#1f77b4', linewidth=2, label='Response Time')
         
         # Format plot with larger fonts
         ax.set_xlabel('Time', color='white', fontsize=16, weight='bold')
         ax.set_ylabel('Response Time (ms)', color='white', fontsize=16, weight='bold')
-        ax.set_title(f'{self.selected_service} - 24 Hour History', color='white', fontsize=18, weight='bold', pad=20)
         ax.grid(True, alpha=0.3)
         ax.legend(fontsize=14, loc='upper left')
+        ax.xaxis.set_major_locator(mdates.AutoDateLocator(tz=_LOCAL_TZ))
         
         # Format axes with larger tick labels
-        # Auto-format time axis based on data range
-        if len(timestamps) > 0:
-            time_range = (timestamps[-1] - timestamps[0]).total_seconds()
-            if time_range < 3600:  # Less than 1 hour
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-            elif time_range < 86400:  # Less than 24 hours
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-            else:
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d %H:%M'))
-        
         ax.tick_params(colors='white', labelsize=14)
         ax.spines['bottom'].set_color('white')
         ax.spines['left'].set_color('white')
@@ -323,67 +437,138 @@ class ServiceMonitorGUI:
         ax.spines['bottom'].set_linewidth(2)
         ax.spines['left'].set_linewidth(2)
         
-        # Rotate x-axis labels for better readability
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
         fig.tight_layout()
         
         # Embed in tkinter
         canvas = FigureCanvasTkAgg(fig, master=self.graph_frame)
-        canvas.draw()
         canvas.get_tk_widget().pack(fill="both", expand=True)
+        
+        self._fig = fig
+        self._ax = ax
+        self._canvas = canvas
+        self._epoch_datenum = mdates.date2num(datetime(1970, 1, 1, tzinfo=timezone.utc))
+        self._graph_service = None
     
-    def _update_ui(self):
-        """Update UI with current service status"""
-        for service_name, indicators in self.status_indicators.items():
+    def _show_waiting_message(self, service_data):
+        """Replace the graph with a "waiting for data" message"""
+        # Hide (rather than destroy) the canvas so it can be reused; the
+        # next draw clears the old shading since the service is reset
+        if self._waiting_frame is not None:
+            self._waiting_frame.destroy()
+        if self._canvas is not None:
+            self._canvas.get_tk_widget().pack_forget()
+        self._graph_service = None
+        self._drawn_key = None
+        
+        info_frame = ctk.CTkFrame(self.graph_frame)
+        info_frame.pack(expand=True)
+        self._waiting_frame = info_frame
+        
+        ctk.CTkLabel(
+            info_frame,
+            text=f"Waiting for data from {self.selected_service}...",
+            font=self._fonts['message']
+        ).pack(pady=10)
+        
+        if service_data and service_data.last_check > 0:
+            ctk.CTkLabel(
+                info_frame,
+                text=f"Last check: {self._format_clock(service_data.last_check)}",
+                font=self._fonts['meta'],
+                text_color="gray"
+            ).pack()
+        else:
+            ctk.CTkLabel(
+                info_frame,
+                text="Monitoring will begin shortly...",
+                font=self._fonts['meta'],
+                text_color="gray"
+            ).pack()
+    
+    def _format_clock(self, ts: float) -> str:
+        """Format a timestamp as a clock time, cached per whole second"""
+        key = int(ts)
+        time_str = self._time_str_cache.get(key)
+        if time_str is None:
+            time_str = datetime.fromtimestamp(ts).strftime('%I:%M:%S %p')
+            self._time_str_cache[key] = time_str
+            if len(self._time_str_cache) > _TIME_STR_CACHE_SIZE:
+                # Evict the oldest entry (dicts keep insertion order)
+                del self._time_str_cache[next(iter(self._time_str_cache))]
+        return time_str
+    
+    def _drain_events(self):
+        """Apply pending monitor events to the UI"""
+        while True:
+            try:
+                _, service_name = self._ui_events.get_nowait()
+            except queue.Empty:
+                break
+            self._dirty_indicators.add(service_name)
+            if service_name == self.selected_service:
+                self._graph_dirty = True
+        
+        current_tab = self.notebook.get()
+        
+        # Indicators are only visible on the dashboard tab
+        if current_tab == "Dashboard":
+            for service_name in self._dirty_indicators:
+                self._update_indicator(service_name)
+            self._dirty_indicators.clear()
+            
+            # "Time ago" labels advance without any new events
+            now = time.monotonic()
+            if now - self._last_time_refresh >= 1:
+                self._update_time_labels()
+                self._last_time_refresh = now
+        
+        if current_tab == "Details" and self.selected_service and self._graph_dirty:
+            self._update_graph()
+            self._graph_dirty = False
+        
+        # Schedule next drain
+        self.window.after(100, self._drain_events)
+    
+    def _update_indicator(self, service_name: str):
+        """Update a dashboard status row if its state changed"""
+        service_data = self.monitor.get_service_data(service_name)
+        if not service_data or not self._tree.exists(service_name):
+            return
+        
+        state = (service_data.current_status, round(service_data.response_time, 3), service_data.last_check)
+        if state == self._last_indicator_state.get(service_name):
+            return
+        self._last_indicator_state[service_name] = state
+        
+        # Update status text and row color
+        self._tree.set(service_name, 'status', service_data.current_status.value.upper())
+        self._tree.item(service_name, tags=(service_data.current_status.value,))
+        
+        # Update response time
+        if service_data.response_time > 0:
+            self._tree.set(service_name, 'rt', f"{service_data.response_time * 1000:.0f} ms")
+    
+    def _update_time_labels(self):
+        """Update the "last check" column of every row whose text changed"""
+        now_ts = time.time()
+        for service_name in self._tree.get_children():
             service_data = self.monitor.get_service_data(service_name)
             
-            if service_data:
-                # Update status light
-                color_map = {
-                    ServiceStatus.GREEN: "#00ff00",
-                    ServiceStatus.YELLOW: "#ffff00",
-                    ServiceStatus.RED: "#ff0000"
-                }
-                color = color_map.get(service_data.current_status, "gray")
-                indicators['canvas'].itemconfig(indicators['circle'], fill=color)
-                
-                # Update status text
-                indicators['status_label'].configure(
-                    text=service_data.current_status.value.upper()
-                )
-                
-                # Update response time
-                if service_data.response_time > 0:
-                    indicators['response_label'].configure(
-                        text=f"{service_data.response_time * 1000:.0f} ms"
-                    )
-                
-                # Update last check time
-                if service_data.last_check > 0:
-                    last_check = datetime.fromtimestamp(service_data.last_check)
-                    time_ago = datetime.now() - last_check
-                    if time_ago.seconds < 60:
-                        time_str = f"{time_ago.seconds}s ago"
-                    else:
-                        time_str = f"{time_ago.seconds // 60}m ago"
-                    indicators['time_label'].configure(text=time_str)
-        
-        # Only update graph every 5 seconds and if tab is active
-        current_time = datetime.now()
-        if not hasattr(self, '_last_graph_update'):
-            self._last_graph_update = current_time
-        
-        if self.notebook.get() == "Details" and self.selected_service:
-            if (current_time - self._last_graph_update).total_seconds() >= 5:
-                self._update_graph()
-                self._last_graph_update = current_time
-        
-        # Schedule next update
-        self.window.after(1000, self._update_ui)
+            # Update last check time
+            if service_data and service_data.last_check > 0:
+                secs = int(now_ts - service_data.last_check)
+                if secs < 60:
+                    time_str = f"{secs}s ago"
+                else:
+                    time_str = f"{secs // 60}m ago"
+                if time_str != self._last_time_str.get(service_name):
+                    self._last_time_str[service_name] = time_str
+                    self._tree.set(service_name, 'last', time_str)
     
     def on_status_change(self, service_name: str, old_status: ServiceStatus, new_status: ServiceStatus):
-        """Handle service status changes"""
+        """Handle service status changes (called from the monitor thread)"""
+        self._ui_events.put(('status', service_name))
+        
         if new_status == ServiceStatus.RED:
             self.alert_manager.alert_service_down(service_name)
         elif new_status == ServiceStatus.YELLOW:
@@ -391,11 +576,23 @@ class ServiceMonitorGUI:
         elif old_status in [ServiceStatus.RED, ServiceStatus.YELLOW] and new_status == ServiceStatus.GREEN:
             self.alert_manager.alert_service_restored(service_name)
     
+    def on_check_complete(self, service_name: str):
+        """Handle a completed service check (called from the monitor thread)"""
+        self._ui_events.put(('data', service_name))
+    
     def _run_monitor(self):
         """Run the monitor in a background thread"""
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(self.monitor.monitor_loop())
+        self._monitor_task = loop.create_task(self.monitor.monitor_loop())
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._monitor_task)
+        except asyncio.CancelledError:
+            # Cancelled by cleanup() while the monitor was waiting
+            pass
+        finally:
+            loop.close()
     
     def run(self):
         """Start the GUI application"""
@@ -404,6 +601,14 @@ class ServiceMonitorGUI:
     def cleanup(self):
         """Cleanup on exit"""
         self.monitor.stop()
+        self.alert_manager.close()
+        if self._loop is not None:
+            # Cancelling lets monitor_loop close its HTTP session on the way out
+            try:
+                self._loop.call_soon_threadsafe(self._monitor_task.cancel)
+            except RuntimeError:
+                pass  # The monitor already finished and closed its loop
+            self.monitor_thread.join(timeout=2)
 
 
 if __name__ == "__main__":
@@ -5,15 +5,44 @@ Handles service health checks, data persistence, and status tracking
 
 import asyncio
 import aiohttp
+import inspect
+import os
+import ssl
+import sys
 import time
 import json
 import yaml
+import numpy as np
+from collections import namedtuple
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+from yarl import URL
+from dataclasses import dataclass, field, fields
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Fall back to the (slower) standard library encoder
+    orjson = None
+
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed parser
+except ImportError:
+    from yaml import SafeLoader
+
+try:
+    import aiodns  # Required by aiohttp.AsyncResolver
+except ImportError:  # Fall back to aiohttp's threaded getaddrinfo resolver
+    aiodns = None
+
+
+def _encode_line(obj) -> bytes:
+    """Encode an object as one JSON line"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj) + "\n").encode()
+
 
 class ServiceStatus(Enum):
     """Service health status"""
@@ -22,7 +51,24 @@ class ServiceStatus(Enum):
     RED = "red"  # Down
 
 
-@dataclass
+# Compact status codes used by the array storage of history
+STATUS_CODES = {
+    ServiceStatus.GREEN: 0,
+    ServiceStatus.YELLOW: 1,
+    ServiceStatus.RED: 2,
+}
+_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+
+# Seconds monitor_loop waits for queued async callbacks when shutting down,
+# kept below the GUI's 2 s join of the monitor thread
+_SHUTDOWN_CALLBACK_TIMEOUT = 1
+
+# Slotted dataclasses (no per-instance __dict__) need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ServiceCheck:
     """Single service check result"""
     timestamp: float
@@ -31,49 +77,209 @@ class ServiceCheck:
     error: Optional[str] = None
 
 
-@dataclass
+class CheckHistory:
+    """Time-ordered check history stored column-wise in NumPy buffers
+    
+    Timestamps, response times and status codes live in parallel arrays;
+    error messages are only stored for the (rare) checks that have one.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        # (timestamps, response times, status codes, base, start, end), where
+        # base is the absolute index of buffer position 0. Replaced as a whole
+        # so readers on another thread always see a consistent snapshot.
+        self._state = (
+            np.empty(capacity, dtype=np.float64),
+            np.empty(capacity, dtype=np.float64),
+            np.empty(capacity, dtype=np.int8),
+            0, 0, 0
+        )
+        self._errors: Dict[int, str] = {}  # absolute index -> error message
+    
+    @classmethod
+    def from_json(cls, data) -> 'CheckHistory':
+        """Build history from its JSON form (columns, or legacy per-check records)"""
+        if isinstance(data, list):
+            return cls.from_records(data)
+        
+        count = len(data['timestamp'])
+        history = cls(max(1024, 2 * count))
+        ts, rt, status = history._state[:3]
+        ts[:count] = data['timestamp']
+        rt[:count] = data['response_time']
+        status[:count] = data['status']
+        history._errors = {int(i): error for i, error in data['errors'].items()}
+        history._state = (ts, rt, status, 0, 0, count)
+        return history
+    
+    @classmethod
+    def from_records(cls, records: list) -> 'CheckHistory':
+        """Build history from legacy per-check dicts"""
+        count = len(records)
+        history = cls(max(1024, 2 * count))
+        ts, rt, status = history._state[:3]
+        ts[:count] = [record['timestamp'] for record in records]
+        rt[:count] = [record['response_time'] for record in records]
+        status[:count] = [
+            STATUS_CODES[ServiceStatus(record['status'])] for record in records
+        ]
+        history._errors = {
+            i: record['error'] for i, record in enumerate(records) if record.get('error')
+        }
+        history._state = (ts, rt, status, 0, 0, count)
+        return history
+    
+    def __len__(self) -> int:
+        start, end = self._state[4:]
+        return end - start
+    
+    def __iter__(self):
+        """Iterate checks as ServiceCheck objects (oldest first)"""
+        ts, rt, status, base, start, end = self._state
+        first = base + start
+        errors = self._errors
+        for i, (timestamp, response_time, code) in enumerate(zip(
+            ts[start:end].tolist(), rt[start:end].tolist(), status[start:end].tolist()
+        )):
+            yield ServiceCheck(
+                timestamp=timestamp,
+                status=_STATUSES[code],
+                response_time=response_time,
+                error=errors.get(first + i)
+            )
+    
+    def append(self, check: ServiceCheck):
+        """Append a check, growing or compacting the buffers when full"""
+        if self._state[5] == len(self._state[0]):
+            self._reallocate()
+        ts, rt, status, base, start, i = self._state
+        # Slot i is beyond every published end, so readers never see it half-written
+        ts[i] = check.timestamp
+        rt[i] = check.response_time
+        status[i] = STATUS_CODES[check.status]
+        if check.error:
+            self._errors[base + i] = check.error
+        self._state = (ts, rt, status, base, start, i + 1)
+    
+    def prune(self, cutoff_time: float):
+        """Drop checks at or before cutoff_time (binary search on timestamps)"""
+        ts, rt, status, base, start, end = self._state
+        expired = int(np.searchsorted(ts[start:end], cutoff_time, side='right'))
+        if not expired:
+            return
+        start += expired
+        self._state = (ts, rt, status, base, start, end)
+        if self._errors:
+            first = base + start
+            self._errors = {i: error for i, error in self._errors.items() if i >= first}
+    
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (timestamps, response times in seconds, status codes) views"""
+        ts, rt, status, _, start, end = self._state
+        return ts[start:end], rt[start:end], status[start:end]
+    
+    def to_columns(self, as_lists: bool = False) -> dict:
+        """Convert to a column dict for JSON serialization
+        
+        Status is stored as STATUS_CODES values and errors are keyed by
+        position. Arrays are returned as-is (for orjson) unless as_lists.
+        """
+        ts, rt, status, base, start, end = self._state
+        first = base + start
+        ts, rt, status = ts[start:end], rt[start:end], status[start:end]
+        if as_lists:
+            ts, rt, status = ts.tolist(), rt.tolist(), status.tolist()
+        return {
+            'timestamp': ts,
+            'response_time': rt,
+            'status': status,
+            'errors': {str(i - first): error for i, error in self._errors.items()}
+        }
+    
+    def _reallocate(self):
+        # Always copy into fresh buffers so views handed out earlier
+        # (possibly held by the GUI thread) are never overwritten, then
+        # publish them together with the new indices in one assignment
+        ts, rt, status, base, start, end = self._state
+        count = end - start
+        capacity = max(1024, 2 * count)
+        buffers = []
+        for old in (ts, rt, status):
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:count] = old[start:end]
+            buffers.append(new)
+        self._state = (*buffers, base + start, 0, count)
+
+
+# Per-service settings read on every check, resolved once from the config
+ServiceCfg = namedtuple('ServiceCfg', 'name url expected_status method lightweight')
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ServiceData:
     """Service monitoring data"""
     name: str
-    url: str
+    url: URL  # Parsed once; aiohttp takes it without re-parsing
     current_status: ServiceStatus
     last_check: float
     response_time: float
     consecutive_failures: int
-    history: List[ServiceCheck]
+    history: CheckHistory = field(default_factory=CheckHistory)
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['url'] = str(self.url)
         data['current_status'] = self.current_status.value
-        data['history'] = [
-            {
-                'timestamp': check.timestamp,
-                'status': check.status.value,
-                'response_time': check.response_time,
-                'error': check.error
-            }
-            for check in self.history
-        ]
+        data['history'] = self.history.to_columns(as_lists=True)
         return data
 
 
+def _orjson_default(obj):
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, CheckHistory):
+        return obj.to_columns()
+    if isinstance(obj, URL):
+        return str(obj)
+    raise TypeError
+
+
 class ServiceMonitor:
     """Main service monitoring engine"""
     
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = Path(config_path)
         self.config = self._load_config()
+        self._apply_config()
         self.services: Dict[str, ServiceData] = {}
-        self.data_file = Path("data/service_data.json")
+        self.data_file = Path("data/service_data.json")  # Periodic snapshot
+        self.events_file = Path("data/events.jsonl")  # Checks since the snapshot
+        self._event_buffer = []  # Encoded event lines not yet written
+        self._event_fp = None
         self.running = False
+        self._dirty = False  # Unsaved changes since the last _save_data
+        self._last_save = time.monotonic()
+        self._last_cleanup = time.monotonic()
         self.callbacks = []  # Status change callbacks
+        self._session: Optional[aiohttp.ClientSession] = None  # Shared across checks
+        self.check_callbacks = []  # Check completion callbacks
+        self._notify_queue: Optional[asyncio.Queue] = None  # Pending async callbacks
+        self._probes: Dict[URL, tuple] = {}  # URL -> (host, port, use_ssl, request bytes)
+        
+        # TLS context for lightweight probes; like the aiohttp session,
+        # certificates are not verified
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.check_hostname = False
+        self._ssl_context.verify_mode = ssl.CERT_NONE
         
         # Load existing data
         self._load_data()
         
         # Initialize services from config
         self._initialize_services()
+        
+        # Apply checks logged after the last snapshot
+        self._replay_events()
     
     def _load_config(self) -> dict:
         """Load configuration from YAML file"""
@@ -84,111 +290,255 @@ class ServiceMonitor:
             )
         
         with open(self.config_path, 'r') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=SafeLoader)
+    
+    def _apply_config(self):
+        """Cache config values read on every check (call again after a reload)"""
+        self._yellow_threshold = self.config['thresholds']['yellow_response_time']
+        self._red_threshold = self.config['thresholds']['red_consecutive_failures']
+        self._timeout = self.config['monitoring']['timeout']
+        self._client_timeout = aiohttp.ClientTimeout(total=self._timeout)
+        self._history_seconds = self.config['monitoring']['history_duration'] * 3600
     
     def _initialize_services(self):
         """Initialize service tracking from config"""
+        service_cfgs = []
         for service_config in self.config.get('services', []):
             name = service_config['name']
+            url = URL(service_config['url'])
+            service_cfgs.append(ServiceCfg(
+                name=name,
+                url=url,
+                expected_status=service_config.get('expected_status', 200),
+                method=service_config.get('method', 'HEAD').upper(),
+                lightweight=service_config.get('lightweight', False)
+            ))
             if name not in self.services:
                 self.services[name] = ServiceData(
                     name=name,
-                    url=service_config['url'],
+                    url=url,
                     current_status=ServiceStatus.GREEN,
                     last_check=0,
                     response_time=0,
-                    consecutive_failures=0,
-                    history=[]
+                    consecutive_failures=0
                 )
+            else:
+                # The config is authoritative if the URL changed since the last save
+                self.services[name].url = url
+        self._service_cfgs: Tuple[ServiceCfg, ...] = tuple(service_cfgs)
     
     def _load_data(self):
         """Load historical data from disk"""
         if self.data_file.exists():
             try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                    for name, service_data in data.items():
-                        # Reconstruct ServiceData from JSON
-                        history = [
-                            ServiceCheck(
-                                timestamp=check['timestamp'],
-                                status=ServiceStatus(check['status']),
-                                response_time=check['response_time'],
-                                error=check.get('error')
-                            )
-                            for check in service_data['history']
-                        ]
-                        self.services[name] = ServiceData(
-                            name=service_data['name'],
-                            url=service_data['url'],
-                            current_status=ServiceStatus(service_data['current_status']),
-                            last_check=service_data['last_check'],
-                            response_time=service_data['response_time'],
-                            consecutive_failures=service_data['consecutive_failures'],
-                            history=history
-                        )
+                if orjson is not None:
+                    data = orjson.loads(self.data_file.read_bytes())
+                else:
+                    with open(self.data_file, 'r') as f:
+                        data = json.load(f)
+                for name, service_data in data.items():
+                    # Reconstruct ServiceData from JSON
+                    history = CheckHistory.from_json(service_data['history'])
+                    self.services[name] = ServiceData(
+                        name=service_data['name'],
+                        url=URL(service_data['url']),
+                        current_status=ServiceStatus(service_data['current_status']),
+                        last_check=service_data['last_check'],
+                        response_time=service_data['response_time'],
+                        consecutive_failures=service_data['consecutive_failures'],
+                        history=history
+                    )
             except Exception as e:
                 print(f"Error loading data: {e}")
     
+    def _replay_events(self):
+        """Apply logged checks that are newer than the loaded snapshot"""
+        if not self.events_file.exists():
+            return
+        
+        loads = orjson.loads if orjson is not None else json.loads
+        try:
+            with open(self.events_file, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    event = loads(line)
+                    service = self.services.get(event['name'])
+                    if service is None or event['ts'] <= service.last_check:
+                        continue
+                    self._apply_check(service, ServiceCheck(
+                        timestamp=event['ts'],
+                        status=ServiceStatus(event['status']),
+                        response_time=event['rt'],
+                        error=event.get('err')
+                    ))
+        except Exception as e:
+            # A torn final line (crash mid-append) just ends the replay
+            print(f"Error replaying events: {e}")
+    
+    def _log_event(self, name: str, check: ServiceCheck):
+        """Queue a check for the append-only event log"""
+        self._event_buffer.append(_encode_line({
+            'name': name,
+            'ts': check.timestamp,
+            'status': check.status.value,
+            'rt': check.response_time,
+            'err': check.error
+        }))
+    
+    def _flush_events(self):
+        """Append queued checks to the event log"""
+        if not self._event_buffer:
+            return
+        lines, self._event_buffer = self._event_buffer, []
+        
+        if self._event_fp is None:
+            self.events_file.parent.mkdir(exist_ok=True)
+            self._event_fp = open(self.events_file, 'ab')
+        self._event_fp.write(b"".join(lines))
+        self._event_fp.flush()
+    
+    def _truncate_events(self):
+        """Empty the event log once its checks are in a snapshot"""
+        if self._event_fp is not None:
+            self._event_fp.truncate(0)
+        elif self.events_file.exists():
+            self.events_file.write_bytes(b"")
+    
     def _save_data(self):
-        """Save data to disk"""
+        """Save a full snapshot to disk"""
         self.data_file.parent.mkdir(exist_ok=True)
         
-        data = {name: service.to_dict() for name, service in self.services.items()}
+        # Write to a temporary file and swap it in, so a crash mid-write
+        # never leaves a truncated data file behind
+        tmp_file = self.data_file.with_suffix('.json.tmp')
+        if orjson is not None:
+            # orjson walks the dataclasses, enums and history arrays natively
+            tmp_file.write_bytes(orjson.dumps(
+                self.services,
+                default=_orjson_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            ))
+        else:
+            data = {name: service.to_dict() for name, service in self.services.items()}
+            with open(tmp_file, 'w') as f:
+                json.dump(data, f, indent=2)
+        os.replace(tmp_file, self.data_file)
         
-        with open(self.data_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Everything logged so far is now part of the snapshot
+        self._flush_events()
+        self._truncate_events()
+        
+        self._dirty = False
+        self._last_save = time.monotonic()
     
     def _cleanup_old_data(self):
         """Remove data older than configured history duration"""
-        history_seconds = self.config['monitoring']['history_duration'] * 3600
-        cutoff_time = time.time() - history_seconds
+        cutoff_time = time.time() - self._history_seconds
         
         for service in self.services.values():
-            service.history = [
-                check for check in service.history
-                if check.timestamp > cutoff_time
-            ]
+            service.history.prune(cutoff_time)
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            # Resolve DNS asynchronously when aiodns is available, cache lookups
+            # and keep a few idle sockets per host for the next cycle. aiodns
+            # refuses to run on Windows' default Proactor loop.
+            use_aiodns = aiodns is not None and (
+                sys.platform != 'win32'
+                or isinstance(asyncio.get_running_loop(), asyncio.SelectorEventLoop)
+            )
+            connector = aiohttp.TCPConnector(
+                ssl=False,
+                resolver=aiohttp.AsyncResolver() if use_aiodns else None,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+                limit=0,
+                limit_per_host=4,
+                keepalive_timeout=75
+            )
+            self._session = aiohttp.ClientSession(connector=connector, connector_owner=True)
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def __aenter__(self):
+        self._get_session()
+        return self
     
-    async def check_service(self, service_config: dict) -> ServiceCheck:
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def check_service(self, service: ServiceCfg) -> ServiceCheck:
         """Check a single service's health"""
-        name = service_config['name']
-        url = service_config['url']
-        timeout = self.config['monitoring']['timeout']
+        url = service.url
+        method = service.method
+        timeout = self._timeout
         
-        start_time = time.time()
+        # Elapsed time uses the monotonic clock; check timestamps stay wall-clock
+        start_time = time.monotonic()
         
         try:
-            # Increase max_line_size and max_field_size for services with large headers (like Twitter/X)
-            connector = aiohttp.TCPConnector(ssl=False)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(
-                    url, 
-                    timeout=aiohttp.ClientTimeout(total=timeout),
+            status_code = None
+            client_timeout = self._client_timeout
+            
+            if method == 'HEAD' and service.lightweight:
+                status_code = await asyncio.wait_for(self._fast_check(url), timeout)
+                if status_code is None or 300 <= status_code < 400 or status_code in (405, 501):
+                    # Not plain HTTP, a redirect, or no HEAD support - use aiohttp,
+                    # going straight to GET if HEAD was refused. The fallback only
+                    # gets what is left of the check's timeout.
+                    if status_code in (405, 501):
+                        method = 'GET'
+                    status_code = None
+                    remaining = timeout - (time.monotonic() - start_time)
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    client_timeout = aiohttp.ClientTimeout(total=remaining)
+                    start_time = time.monotonic()
+            
+            if status_code is None:
+                session = self._get_session()
+                request_options = dict(
+                    timeout=client_timeout,
                     allow_redirects=True,
                     max_redirects=10
-                ) as response:
-                    response_time = time.time() - start_time
-                    
-                    # Accept 200-399 as successful (includes redirects)
-                    expected_status = service_config.get('expected_status', 200)
-                    if response.status == expected_status or (200 <= response.status < 400):
-                        yellow_threshold = self.config['thresholds']['yellow_response_time']
-                        if response_time > yellow_threshold:
-                            status = ServiceStatus.YELLOW
-                        else:
-                            status = ServiceStatus.GREEN
-                        error = None
-                    else:
-                        status = ServiceStatus.RED
-                        error = f"HTTP {response.status}"
-                    
-                    return ServiceCheck(
-                        timestamp=time.time(),
-                        status=status,
-                        response_time=response_time,
-                        error=error
-                    )
+                )
+                
+                # Only the status line is needed, so the body is never read
+                async with session.request(method, url, **request_options) as response:
+                    status_code = response.status
+                
+                if method == 'HEAD' and status_code in (405, 501):
+                    # Server does not support HEAD - retry once with GET
+                    start_time = time.monotonic()
+                    async with session.get(url, **request_options) as response:
+                        status_code = response.status
+            
+            response_time = time.monotonic() - start_time
+            
+            # Accept 200-399 as successful (includes redirects)
+            if status_code == service.expected_status or (200 <= status_code < 400):
+                if response_time > self._yellow_threshold:
+                    status = ServiceStatus.YELLOW
+                else:
+                    status = ServiceStatus.GREEN
+                error = None
+            else:
+                status = ServiceStatus.RED
+                error = f"HTTP {status_code}"
+            
+            return ServiceCheck(
+                timestamp=time.time(),
+                status=status,
+                response_time=response_time,
+                error=error
+            )
         
         except asyncio.TimeoutError:
             return ServiceCheck(
@@ -201,15 +551,96 @@ class ServiceMonitor:
             return ServiceCheck(
                 timestamp=time.time(),
                 status=ServiceStatus.RED,
-                response_time=time.time() - start_time,
+                response_time=time.monotonic() - start_time,
                 error=str(e)[:100]  # Truncate error message
             )
     
+    async def _fast_check(self, url: URL) -> Optional[int]:
+        """Probe a URL with a bare HEAD request and return the status code
+        
+        Returns None if the reply is not a valid HTTP status line.
+        """
+        probe = self._probes.get(url)
+        if probe is None:
+            host_header = url.raw_authority.rpartition('@')[2]
+            request = (
+                f"HEAD {url.raw_path_qs or '/'} HTTP/1.1\r\n"
+                f"Host: {host_header}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode('latin-1')
+            probe = self._probes[url] = (url.raw_host, url.port, url.scheme == 'https', request)
+        
+        host, port, use_ssl, request = probe
+        reader, writer = await asyncio.open_connection(
+            host, port, ssl=self._ssl_context if use_ssl else None
+        )
+        try:
+            writer.write(request)
+            try:
+                status_line = await reader.readuntil(b"\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return None
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass  # e.g. reset by the peer; the transport is closed either way
+        
+        # e.g. b"HTTP/1.1 200 OK\r\n"
+        parts = status_line.split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith(b"HTTP/") or not parts[1].isdigit():
+            return None
+        return int(parts[1])
+    
     def _update_service_status(self, name: str, check: ServiceCheck):
         """Update service status based on check result"""
         service = self.services[name]
         old_status = service.current_status
         
+        self._apply_check(service, check)
+        self._log_event(name, check)
+        self._dirty = True
+        
+        # Notify callbacks if status changed
+        if old_status != service.current_status:
+            for callback in self.callbacks:
+                self._dispatch_callback(callback, name, old_status, service.current_status)
+        
+        for callback in self.check_callbacks:
+            self._dispatch_callback(callback, name)
+    
+    def _dispatch_callback(self, callback, *args):
+        """Run a sync callback now, or queue an async one for _notify_worker"""
+        if inspect.iscoroutinefunction(callback):
+            if self._notify_queue is None:
+                return  # Not running under monitor_loop
+            try:
+                self._notify_queue.put_nowait((callback, args))
+            except asyncio.QueueFull:
+                print(f"Callback queue full, dropping {callback.__qualname__}")
+            return
+        
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"Error in callback {callback.__qualname__}: {e}")
+    
+    async def _notify_worker(self, timeout: float):
+        """Await queued async callbacks one at a time, each bounded by timeout"""
+        while True:
+            callback, args = await self._notify_queue.get()
+            try:
+                await asyncio.wait_for(callback(*args), timeout)
+            except asyncio.TimeoutError:
+                print(f"Callback {callback.__qualname__} timed out after {timeout}s")
+            except Exception as e:
+                print(f"Error in callback {callback.__qualname__}: {e}")
+            finally:
+                self._notify_queue.task_done()
+    
+    def _apply_check(self, service: ServiceData, check: ServiceCheck):
+        """Record a check result in the service's history and status"""
         # Update history
         service.history.append(check)
         service.last_check = check.timestamp
@@ -222,47 +653,106 @@ class ServiceMonitor:
             service.consecutive_failures = 0
         
         # Determine current status
-        red_threshold = self.config['thresholds']['red_consecutive_failures']
-        if service.consecutive_failures >= red_threshold:
+        if service.consecutive_failures >= self._red_threshold:
             service.current_status = ServiceStatus.RED
         else:
             service.current_status = check.status
-        
-        # Notify callbacks if status changed
-        if old_status != service.current_status:
-            for callback in self.callbacks:
-                callback(name, old_status, service.current_status)
     
     def register_callback(self, callback):
         """Register a callback for status changes"""
         self.callbacks.append(callback)
     
+    def register_check_callback(self, callback):
+        """Register a callback for every completed service check"""
+        self.check_callbacks.append(callback)
+    
     async def monitor_loop(self):
         """Main monitoring loop"""
         self.running = True
         check_interval = self.config['monitoring']['check_interval']
+        save_interval = self.config['monitoring'].get('save_interval', 300)
         
-        while self.running:
-            # Check all services
-            tasks = []
-            service_configs = self.config.get('services', [])
-            
-            for service_config in service_configs:
-                tasks.append(self.check_service(service_config))
-            
-            # Wait for all checks to complete
-            results = await asyncio.gather(*tasks)
-            
-            # Update statuses
-            for service_config, check in zip(service_configs, results):
-                self._update_service_status(service_config['name'], check)
-            
-            # Cleanup old data and save
-            self._cleanup_old_data()
-            self._save_data()
+        # Bound the number of checks (and sockets) in flight at once. Created
+        # here so it belongs to the loop running the monitor.
+        semaphore = asyncio.Semaphore(self.config['monitoring'].get('max_concurrency', 32))
+        
+        # Async callbacks run on a worker task so slow ones never delay checks
+        callback_timeout = self.config['monitoring'].get('callback_timeout', 10)
+        self._notify_queue = asyncio.Queue(maxsize=1000)
+        notify_task = asyncio.create_task(self._notify_worker(callback_timeout))
+        
+        async def bounded_check(service: ServiceCfg) -> ServiceCheck:
+            async with semaphore:
+                return await self.check_service(service)
+        
+        # An executor job keeps running if this task is cancelled, so track it
+        # and let it finish before the final save touches the same files
+        loop = asyncio.get_running_loop()
+        pending = None
+        
+        async def run_job(func):
+            nonlocal pending
+            pending = loop.run_in_executor(None, func)
+            await asyncio.shield(pending)
+        
+        try:
+            while self.running:
+                # Check all services
+                tasks = []
+                service_cfgs = self._service_cfgs
+                
+                for service in service_cfgs:
+                    tasks.append(bounded_check(service))
+                
+                # Wait for all checks to complete; one failing check must not
+                # cancel the others
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                
+                # Update statuses
+                for service, check in zip(service_cfgs, results):
+                    if isinstance(check, Exception):
+                        check = ServiceCheck(
+                            timestamp=time.time(),
+                            status=ServiceStatus.RED,
+                            response_time=0,
+                            error=str(check)[:100]
+                        )
+                    self._update_service_status(service.name, check)
+                
+                # Log this cycle's checks, cleanup old data (once a minute) and
+                # snapshot (at most once per save_interval). All run in the
+                # default executor so the event loop stays free; nothing else
+                # mutates the services while this coroutine waits.
+                await run_job(self._flush_events)
+                if time.monotonic() - self._last_cleanup >= 60:
+                    await run_job(self._cleanup_old_data)
+                    self._last_cleanup = time.monotonic()
+                if self._dirty and time.monotonic() - self._last_save >= save_interval:
+                    await run_job(self._save_data)
+                
+                # Wait for next check
+                await asyncio.sleep(check_interval)
+        finally:
+            if pending is not None and not pending.done():
+                await asyncio.wait([pending])
+            if self._dirty:
+                self._save_data()
+            if self._event_fp is not None:
+                self._event_fp.close()
+                self._event_fp = None
+            await self.close()
             
-            # Wait for next check
-            await asyncio.sleep(check_interval)
+            # Data is safe on disk; give queued callbacks a short, bounded
+            # chance to finish (callers like the GUI only wait briefly)
+            try:
+                await asyncio.wait_for(
+                    self._notify_queue.join(), min(callback_timeout, _SHUTDOWN_CALLBACK_TIMEOUT)
+                )
+            except asyncio.TimeoutError:
+                pass
+            notify_task.cancel()
+            await asyncio.gather(notify_task, return_exceptions=True)
+            self._notify_queue = None
     
     def start(self):
         """Start monitoring (blocking)"""
@@ -276,6 +766,11 @@ class ServiceMonitor:
         """Get data for a specific service"""
         return self.services.get(name)
     
+    def get_history_arrays(self, name: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Get (timestamps, response times in seconds, status codes) arrays for a service"""
+        service = self.services.get(name)
+        return service.history.arrays() if service else None
+    
     def get_all_services(self) -> Dict[str, ServiceData]:
         """Get data for all services"""
         return self.services